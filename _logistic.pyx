@@ -0,0 +1,20 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Ahead-of-time build of the logistic-map recurrence used by fractal_awakening.
+
+Build in place with ``cythonize -i _logistic.pyx``. When the extension is not
+built, fractal_awakening falls back to numba or the pure-Python loop.
+"""
+
+import numpy as np
+
+
+def logistic(double x0, const double[::1] r_sched):
+    """Iterate x = r * x * (1 - x) over a precomputed r schedule."""
+    cdef Py_ssize_t i, n = r_sched.shape[0]
+    cdef double x = x0
+    out = np.empty(n)
+    cdef double[::1] out_view = out
+    for i in range(n):
+        x = r_sched[i] * x * (1 - x)
+        out_view[i] = x
+    return out
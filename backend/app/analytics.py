@@ -1,70 +1,170 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from datetime import date, timedelta
-from typing import Iterable
+from datetime import date, datetime, timedelta
+from typing import Iterable, Protocol
+
+import numpy as np
 
-from .models import Action, Exposure
 from .schemas import AnalyticsSummary, AnalyticsTotals, CapitalsLatest, DailyAnalyticsPoint, WeeklyExposurePoint
 
 
+class SummaryAction(Protocol):
+    # Satisfied by Action rows and by Core Row tuples selected with these labels.
+    occurred_at: datetime
+    o_delta: int
+    r: int
+
+
+class SummaryExposure(Protocol):
+    occurred_at: datetime
+
+
 def _date_span(start: date, end: date) -> list[date]:
     day_count = (end - start).days + 1
     return [start + timedelta(days=offset) for offset in range(day_count)]
 
 
+def _week_span(start: date, end: date) -> tuple[date, int]:
+    # Monday of start's week and the number of Monday-based weeks up to end.
+    first_monday = start - timedelta(days=start.weekday())
+    return first_monday, max(0, (end - first_monday).days // 7 + 1)
+
+
 def compute_summary(
-    actions: Iterable[Action],
-    exposures: Iterable[Exposure],
+    actions: Iterable[SummaryAction],
+    exposures: Iterable[SummaryExposure],
     start: date,
     end: date,
     readiness_latest: float = 0.0,
     capitals_latest: CapitalsLatest | None = None,
     confidence_latest: float = 0.0,
 ) -> AnalyticsSummary:
-    days = _date_span(start, end)
+    n_days = max(0, (end - start).days + 1)
+    start_ord = start.toordinal()
 
-    by_day_o_delta: dict[date, int] = defaultdict(int)
-    by_day_neg_delta: dict[date, int] = defaultdict(int)
-    by_day_irreversibility_values: dict[date, list[float]] = defaultdict(list)
-
-    for action in actions:
-        day = action.occurred_at.date()
-        by_day_o_delta[day] += action.o_delta
-        by_day_neg_delta[day] += min(0, action.o_delta)
-        by_day_irreversibility_values[day].append(float(2 - action.r))
-
-    daily: list[DailyAnalyticsPoint] = []
-    cumulative = 0
-    for idx, day in enumerate(days):
-        day_o_delta = by_day_o_delta[day]
-        cumulative += day_o_delta
-        window_days = days[max(0, idx - 6) : idx + 1]
-        constraint_debt = sum(by_day_neg_delta[d] for d in window_days)
-        iv = by_day_irreversibility_values.get(day, [])
-        irreversibility_avg = sum(iv) / len(iv) if iv else 0.0
-        daily.append(
-            DailyAnalyticsPoint(
-                date=day,
-                o_delta_sum=day_o_delta,
-                cumulative=cumulative,
-                constraint_debt_7d=constraint_debt,
-                irreversibility_avg=round(irreversibility_avg, 2),
-            )
-        )
+    # (day offset, o_delta, 2 - r) per action, binned into per-day arrays.
+    action_cols = np.asarray(
+        [(a.occurred_at.toordinal() - start_ord, a.o_delta, 2 - a.r) for a in actions], dtype=np.int64
+    ).reshape(-1, 3)
+    action_cols = action_cols[(action_cols[:, 0] >= 0) & (action_cols[:, 0] < n_days)]
+    day_idx, o_delta, irreversibility = action_cols[:, 0], action_cols[:, 1], action_cols[:, 2]
+    by_day_o_delta = np.bincount(day_idx, weights=o_delta, minlength=n_days).astype(np.int64)
+    by_day_neg_delta = np.bincount(day_idx, weights=np.minimum(o_delta, 0), minlength=n_days).astype(np.int64)
+    iv_sum = np.bincount(day_idx, weights=irreversibility, minlength=n_days)
+    iv_count = np.bincount(day_idx, minlength=n_days)
 
-    weekly_counts: dict[date, int] = defaultdict(int)
+    first_monday, n_weeks = _week_span(start, end)
+    weekly_counts = [0] * n_weeks
     for exposure in exposures:
-        exp_day = exposure.occurred_at.date()
-        week_start = exp_day - timedelta(days=exp_day.weekday())
-        weekly_counts[week_start] += 1
-
-    weekly_exposure = [
-        WeeklyExposurePoint(week_start=week_start, count=count)
-        for week_start, count in sorted(weekly_counts.items())
-        if start <= week_start <= end or start <= week_start + timedelta(days=6) <= end
+        week_idx = (exposure.occurred_at.date() - first_monday).days // 7
+        if 0 <= week_idx < n_weeks:
+            weekly_counts[week_idx] += 1
+
+    return _build_summary(
+        start,
+        end,
+        by_day_o_delta,
+        by_day_neg_delta,
+        iv_sum,
+        iv_count,
+        weekly_counts,
+        readiness_latest,
+        capitals_latest,
+        confidence_latest,
+    )
+
+
+def compute_summary_from_aggregates(
+    daily_rows: Iterable[tuple[date, int, int, int, int]],
+    weekly_rows: Iterable[tuple[date, int]],
+    start: date,
+    end: date,
+    readiness_latest: float = 0.0,
+    capitals_latest: CapitalsLatest | None = None,
+    confidence_latest: float = 0.0,
+) -> AnalyticsSummary:
+    # daily_rows: (day, o_delta_sum, negative_o_delta_sum, irreversibility_sum, action_count)
+    # weekly_rows: (monday_week_start, exposure_count), e.g. straight from GROUP BY queries.
+    n_days = max(0, (end - start).days + 1)
+    by_day_o_delta = np.zeros(n_days, dtype=np.int64)
+    by_day_neg_delta = np.zeros(n_days, dtype=np.int64)
+    iv_sum = np.zeros(n_days)
+    iv_count = np.zeros(n_days, dtype=np.int64)
+    for day, o_delta_sum, neg_delta_sum, irreversibility_sum, action_count in daily_rows:
+        idx = (day - start).days
+        if 0 <= idx < n_days:
+            by_day_o_delta[idx] += o_delta_sum
+            by_day_neg_delta[idx] += neg_delta_sum
+            iv_sum[idx] += irreversibility_sum
+            iv_count[idx] += action_count
+
+    first_monday, n_weeks = _week_span(start, end)
+    weekly_counts = [0] * n_weeks
+    for week_start, count in weekly_rows:
+        week_idx = (week_start - first_monday).days // 7
+        if 0 <= week_idx < n_weeks:
+            weekly_counts[week_idx] += count
+
+    return _build_summary(
+        start,
+        end,
+        by_day_o_delta,
+        by_day_neg_delta,
+        iv_sum,
+        iv_count,
+        weekly_counts,
+        readiness_latest,
+        capitals_latest,
+        confidence_latest,
+    )
+
+
+def _build_summary(
+    start: date,
+    end: date,
+    by_day_o_delta: np.ndarray,
+    by_day_neg_delta: np.ndarray,
+    iv_sum: np.ndarray,
+    iv_count: np.ndarray,
+    weekly_counts: list[int],
+    readiness_latest: float,
+    capitals_latest: CapitalsLatest | None,
+    confidence_latest: float,
+) -> AnalyticsSummary:
+    # Per-day arrays are indexed by day offset from start; weekly_counts by
+    # week offset from the Monday of start's week.
+    days = _date_span(start, end)
+    first_monday, _ = _week_span(start, end)
+
+    cumulative = np.cumsum(by_day_o_delta)
+    # 7-day trailing sum of negative deltas as a difference of prefix sums.
+    constraint_debt = np.cumsum(by_day_neg_delta)
+    constraint_debt[7:] -= constraint_debt[:-7].copy()
+    irreversibility_avg = np.divide(iv_sum, iv_count, out=np.zeros(len(days)), where=iv_count > 0)
+
+    daily = [
+        DailyAnalyticsPoint(
+            date=day,
+            o_delta_sum=day_o_delta,
+            cumulative=day_cumulative,
+            constraint_debt_7d=day_debt,
+            irreversibility_avg=round(day_irreversibility, 2),
+        )
+        for day, day_o_delta, day_cumulative, day_debt, day_irreversibility in zip(
+            days,
+            by_day_o_delta.tolist(),
+            cumulative.tolist(),
+            constraint_debt.tolist(),
+            irreversibility_avg.tolist(),
+        )
     ]
 
+    weekly_exposure: list[WeeklyExposurePoint] = []
+    for week_idx, count in enumerate(weekly_counts):
+        week_start = first_monday + timedelta(days=7 * week_idx)
+        if count and (start <= week_start <= end or start <= week_start + timedelta(days=6) <= end):
+            weekly_exposure.append(WeeklyExposurePoint(week_start=week_start, count=count))
+
     sum_o_delta = sum(point.o_delta_sum for point in daily)
     totals = AnalyticsTotals(
         sum_o_delta=sum_o_delta,
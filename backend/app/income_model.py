@@ -1,20 +1,36 @@
 from __future__ import annotations
 
 import math
-from collections import defaultdict
-from dataclasses import dataclass
 from datetime import date, datetime, timedelta
-from typing import Iterable
+from typing import Iterable, NamedTuple, Protocol
 
-from .models import Action, Exposure, IncomeModelSettings
+import numpy as np
 
-NETWORK_TYPES = {"outreach", "interview", "proposal", "post", "portfolio_update"}
-LEAD_TYPES = {"application", "outreach", "proposal", "post"}
-ENERGY_DOMAINS = {"sleep", "nutrition", "movement", "stress"}
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the NumPy kernel
+    njit = None
 
+from .models import IncomeModelSettings
 
-@dataclass
-class IncomePoint:
+NETWORK_TYPES = frozenset({"outreach", "interview", "proposal", "post", "portfolio_update"})
+LEAD_TYPES = frozenset({"application", "outreach", "proposal", "post"})
+ENERGY_DOMAINS = frozenset({"sleep", "nutrition", "movement", "stress"})
+
+
+class ActionEvent(Protocol):
+    # Satisfied by Action rows and by Core Row tuples selected with these labels.
+    occurred_at: datetime
+    h: int
+    e: int
+
+
+class ExposureEvent(Protocol):
+    occurred_at: datetime
+    type: str
+
+
+class IncomePoint(NamedTuple):
     date: date
     s: float
     n: float
@@ -37,23 +53,15 @@ def saturate(raw: float, k: float) -> float:
     return clamp01(1 - math.exp(-k * max(0.0, raw)))
 
 
-def _daterange(start: date, end: date) -> list[date]:
-    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
-
+def _saturate_nonneg(raw: float, k: float) -> float:
+    # saturate() for raw >= 0, where the result is already in [0, 1). Not
+    # expm1: a negligible raw must still saturate to exactly 0.0 so the
+    # low-data defaults apply.
+    return 1.0 - math.exp(-k * raw)
 
-def _weighted_avg(values: list[tuple[float, float]]) -> float:
-    if not values:
-        return 0.0
-    num = sum(v * w for v, w in values)
-    den = sum(w for _, w in values)
-    return num / den if den else 0.0
 
-
-def _variance(values: list[float]) -> float:
-    if len(values) < 2:
-        return 0.0
-    mean = sum(values) / len(values)
-    return sum((x - mean) ** 2 for x in values) / len(values)
+def _daterange(start: date, end: date) -> list[date]:
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
 
 
 def get_or_create_settings(db, now: datetime | None = None) -> IncomeModelSettings:
@@ -77,68 +85,308 @@ def get_or_create_settings(db, now: datetime | None = None) -> IncomeModelSettin
     return settings
 
 
+def _window_mask(days_ago: np.ndarray, window_days: int) -> np.ndarray:
+    return (days_ago >= 0) & (days_ago < window_days)
+
+
+def _decay_matrix(days_ago: np.ndarray, decay_lut: np.ndarray) -> np.ndarray:
+    window_days = decay_lut.shape[0] - 1
+    lut_idx = np.where(_window_mask(days_ago, window_days), days_ago, window_days)
+    return np.where(lut_idx < window_days, decay_lut[lut_idx], 0.0)
+
+
+def _masked_mean(weights: np.ndarray, values: np.ndarray) -> np.ndarray:
+    num = weights @ values
+    den = weights.sum(axis=1)
+    return np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+
+
+def _accumulate_vectorized(
+    day_ords: np.ndarray,
+    action_days: np.ndarray,
+    action_h: np.ndarray,
+    action_e: np.ndarray,
+    exposure_days: np.ndarray,
+    exposure_is_network: np.ndarray,
+    exposure_is_lead: np.ndarray,
+    decay_lut: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    window_days = decay_lut.shape[0] - 1
+    action_decay = _decay_matrix(np.subtract.outer(day_ords, action_days), decay_lut)
+    exposure_decay = _decay_matrix(np.subtract.outer(day_ords, exposure_days), decay_lut)
+
+    skill_contrib = np.clip((np.maximum(0, action_h) + np.maximum(0, action_e)) / 4, 0.0, 1.0)
+    energy_signal = np.clip((action_e + 2) / 4, 0.0, 1.0)
+    s_raw = _masked_mean(action_decay, skill_contrib)
+    e_raw = _masked_mean(action_decay, energy_signal)
+    network_raw = exposure_decay @ exposure_is_network
+    lead_raw = exposure_decay @ exposure_is_lead
+
+    # Energy stability: population variance of the per-calendar-day mean energy
+    # across the logged days inside each window.
+    logged_action_days, inverse = np.unique(action_days, return_inverse=True)
+    daily_energy_means = np.bincount(inverse, weights=energy_signal, minlength=len(logged_action_days)) / np.maximum(
+        np.bincount(inverse, minlength=len(logged_action_days)), 1
+    )
+    energy_days_in_window = _window_mask(np.subtract.outer(day_ords, logged_action_days), window_days).astype(np.float64)
+    energy_day_count = energy_days_in_window.sum(axis=1)
+    energy_mean = _masked_mean(energy_days_in_window, daily_energy_means)
+    energy_sq_dev = energy_days_in_window * (daily_energy_means[None, :] - energy_mean[:, None]) ** 2
+    energy_variance = np.divide(
+        energy_sq_dev.sum(axis=1), energy_day_count, out=np.zeros_like(energy_day_count), where=energy_day_count >= 2
+    )
+    var_penalty = np.clip(energy_variance / 0.05, 0.0, 1.0)
+
+    return s_raw, network_raw, lead_raw, e_raw, var_penalty
+
+
+def _accumulate_loops(
+    day_ords: np.ndarray,
+    action_days: np.ndarray,
+    action_h: np.ndarray,
+    action_e: np.ndarray,
+    exposure_days: np.ndarray,
+    exposure_is_network: np.ndarray,
+    exposure_is_lead: np.ndarray,
+    decay_lut: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Sliding-window kernel for numba. Expects consecutive day_ords and events
+    # sorted by day: each step decays the running sums by one day, drops the
+    # events leaving the window and adds the ones entering it, so the cost is
+    # O(days + events) instead of O(days * events). The energy variance uses
+    # Welford's update (and its inverse for days leaving the window).
+    n_days = day_ords.shape[0]
+    s_raw = np.zeros(n_days)
+    network_raw = np.zeros(n_days)
+    lead_raw = np.zeros(n_days)
+    e_raw = np.zeros(n_days)
+    var_penalty = np.zeros(n_days)
+    if n_days == 0:
+        return s_raw, network_raw, lead_raw, e_raw, var_penalty
+
+    window_days = decay_lut.shape[0] - 1
+    step = decay_lut[1]
+    expired = decay_lut[window_days]
+    first_day = day_ords[0] - window_days + 1
+
+    n_actions = action_days.shape[0]
+    a_head = 0
+    while a_head < n_actions and action_days[a_head] < first_day:
+        a_head += 1
+    a_tail = a_head
+    skill_num = 0.0
+    energy_num = 0.0
+    weight = 0.0
+    n_skill = 0
+    n_energy = 0
+    # Welford state over the per-calendar-day energy means in the window.
+    n_daily = 0
+    daily_mean = 0.0
+    daily_m2 = 0.0
+
+    n_exposures = exposure_days.shape[0]
+    x_head = 0
+    while x_head < n_exposures and exposure_days[x_head] < first_day:
+        x_head += 1
+    x_tail = x_head
+    network = 0.0
+    lead = 0.0
+    n_network = 0
+    n_lead = 0
+
+    for day in range(first_day, day_ords[n_days - 1] + 1):
+        skill_num *= step
+        energy_num *= step
+        weight *= step
+        network *= step
+        lead *= step
+
+        # Drop the calendar day that just left the window.
+        group_sum = 0.0
+        group_count = 0
+        while a_head < a_tail and action_days[a_head] <= day - window_days:
+            skill = min(1.0, (max(0, action_h[a_head]) + max(0, action_e[a_head])) / 4.0)
+            energy = min(1.0, max(0.0, (action_e[a_head] + 2) / 4.0))
+            skill_num -= skill * expired
+            energy_num -= energy * expired
+            n_skill -= skill > 0
+            n_energy -= energy > 0
+            weight -= expired
+            group_sum += energy
+            group_count += 1
+            a_head += 1
+        if group_count:
+            day_energy = group_sum / group_count
+            n_daily -= 1
+            if n_daily == 0:
+                daily_mean = 0.0
+                daily_m2 = 0.0
+            else:
+                delta = day_energy - daily_mean
+                daily_mean -= delta / n_daily
+                daily_m2 -= delta * (day_energy - daily_mean)
+
+        # Add the calendar day that just entered it, with decay 1.
+        group_sum = 0.0
+        group_count = 0
+        while a_tail < n_actions and action_days[a_tail] == day:
+            skill = min(1.0, (max(0, action_h[a_tail]) + max(0, action_e[a_tail])) / 4.0)
+            energy = min(1.0, max(0.0, (action_e[a_tail] + 2) / 4.0))
+            skill_num += skill
+            energy_num += energy
+            n_skill += skill > 0
+            n_energy += energy > 0
+            weight += 1.0
+            group_sum += energy
+            group_count += 1
+            a_tail += 1
+        if group_count:
+            day_energy = group_sum / group_count
+            n_daily += 1
+            delta = day_energy - daily_mean
+            daily_mean += delta / n_daily
+            daily_m2 += delta * (day_energy - daily_mean)
+
+        while x_head < x_tail and exposure_days[x_head] <= day - window_days:
+            if exposure_is_network[x_head]:
+                network -= expired
+                n_network -= 1
+            if exposure_is_lead[x_head]:
+                lead -= expired
+                n_lead -= 1
+            x_head += 1
+        while x_tail < n_exposures and exposure_days[x_tail] == day:
+            if exposure_is_network[x_tail]:
+                network += 1.0
+                n_network += 1
+            if exposure_is_lead[x_tail]:
+                lead += 1.0
+                n_lead += 1
+            x_tail += 1
+
+        # Reset instead of carrying rounding residue once a window empties.
+        if a_head == a_tail:
+            weight = 0.0
+        if n_skill == 0:
+            skill_num = 0.0
+        if n_energy == 0:
+            energy_num = 0.0
+        if n_network == 0:
+            network = 0.0
+        if n_lead == 0:
+            lead = 0.0
+
+        i = day - day_ords[0]
+        if i < 0:
+            continue
+        if weight > 0:
+            s_raw[i] = skill_num / weight
+            e_raw[i] = energy_num / weight
+        if n_daily >= 2:
+            var_penalty[i] = min(1.0, max(0.0, daily_m2 / n_daily) / 0.05)
+        network_raw[i] = max(0.0, network)
+        lead_raw[i] = max(0.0, lead)
+
+    return s_raw, network_raw, lead_raw, e_raw, var_penalty
+
+
+if njit is not None:
+    _accumulate = njit(cache=True, fastmath=True)(_accumulate_loops)
+    # Compile (or load the cached build) at import instead of on the first request.
+    _accumulate(
+        np.zeros(1, dtype=np.int64),
+        np.zeros(1, dtype=np.int64),
+        np.zeros(1, dtype=np.int64),
+        np.zeros(1, dtype=np.int64),
+        np.zeros(1, dtype=np.int64),
+        np.zeros(1, dtype=np.bool_),
+        np.zeros(1, dtype=np.bool_),
+        np.ones(2),
+    )
+else:
+    _accumulate = _accumulate_vectorized
+
+
+def _logged_day_counts(
+    day_ords: np.ndarray, action_days: np.ndarray, exposure_days: np.ndarray, window_days: int
+) -> np.ndarray:
+    logged_days = np.union1d(action_days, exposure_days)
+    return np.searchsorted(logged_days, day_ords, side="right") - np.searchsorted(
+        logged_days, day_ords - (window_days - 1), side="left"
+    )
+
+
 def compute_income_series(
-    actions: Iterable[Action],
-    exposures: Iterable[Exposure],
+    actions: Iterable[ActionEvent],
+    exposures: Iterable[ExposureEvent],
     start: date,
     end: date,
     settings: IncomeModelSettings,
     window_days: int = 60,
 ) -> list[IncomePoint]:
-    actions_list = list(actions)
-    exposures_list = list(exposures)
     all_days = _daterange(start, end)
 
+    # Structure-of-arrays view of the events, sorted by day, handed to the
+    # numba kernel (or the NumPy fallback) in a single call. Each input is
+    # consumed in one pass, so callers may stream rows instead of lists.
+    day_ords = np.fromiter((day.toordinal() for day in all_days), dtype=np.int64, count=len(all_days))
+    action_cols = np.asarray(
+        [(a.occurred_at.toordinal(), a.h, a.e) for a in actions], dtype=np.int64
+    ).reshape(-1, 3)
+    action_cols = action_cols[np.argsort(action_cols[:, 0], kind="stable")]
+    action_days = np.ascontiguousarray(action_cols[:, 0])
+    action_h = np.ascontiguousarray(action_cols[:, 1])
+    action_e = np.ascontiguousarray(action_cols[:, 2])
+    exposure_cols = [(ex.occurred_at.toordinal(), ex.type) for ex in exposures]
+    exposure_days = np.fromiter((day for day, _ in exposure_cols), dtype=np.int64, count=len(exposure_cols))
+    # Exposure types repeat heavily, so classify each distinct raw type once
+    # and map its (is_network, is_lead) flags back onto the events through
+    # the unique() inverse.
+    raw_types, exposure_type_idx = np.unique(
+        np.array([raw for _, raw in exposure_cols], dtype=object), return_inverse=True
+    )
+    kind_flags = np.zeros((len(raw_types), 2), dtype=np.bool_)
+    for idx, raw in enumerate(raw_types):
+        kind = raw.lower().strip()
+        kind_flags[idx] = (kind in NETWORK_TYPES, kind in LEAD_TYPES)
+    exposure_order = np.argsort(exposure_days, kind="stable")
+    exposure_days = exposure_days[exposure_order]
+    exposure_flags = kind_flags[exposure_type_idx[exposure_order]]
+    exposure_is_network = np.ascontiguousarray(exposure_flags[:, 0])
+    exposure_is_lead = np.ascontiguousarray(exposure_flags[:, 1])
+
+    # decay_lut[d] == decay_factor(d, half_life_days); the extra last entry is
+    # the weight an event carries on the day it leaves the window.
+    decay_lut = 0.5 ** (np.arange(window_days + 1) / max(1, settings.half_life_days))
+
+    s_raw, network_raw, lead_raw, e_raw, var_penalty = _accumulate(
+        day_ords,
+        action_days,
+        action_h,
+        action_e,
+        exposure_days,
+        exposure_is_network,
+        exposure_is_lead,
+        decay_lut,
+    )
+    days_logged = _logged_day_counts(day_ords, action_days, exposure_days, window_days)
+
     points: list[IncomePoint] = []
-    for day in all_days:
-        window_start = day - timedelta(days=window_days - 1)
-
-        skill_weighted: list[tuple[float, float]] = []
-        network_raw = 0.0
-        lead_raw = 0.0
-        energy_weighted: list[tuple[float, float]] = []
-        energy_daily: dict[date, list[float]] = defaultdict(list)
-        days_with_any_logs: set[date] = set()
-
-        for a in actions_list:
-            ad = a.occurred_at.date()
-            if ad < window_start or ad > day:
-                continue
-            days_ago = (day - ad).days
-            decay = decay_factor(days_ago, settings.half_life_days)
-            days_with_any_logs.add(ad)
-
-            skill_contrib = clamp01((max(0, a.h) + max(0, a.e)) / 4)
-            skill_weighted.append((skill_contrib, decay))
-
-            energy_signal = clamp01((a.e + 2) / 4)
-            energy_weighted.append((energy_signal, decay))
-            energy_daily[ad].append(energy_signal)
-
-        for ex in exposures_list:
-            ed = ex.occurred_at.date()
-            if ed < window_start or ed > day:
-                continue
-            days_ago = (day - ed).days
-            decay = decay_factor(days_ago, settings.half_life_days)
-            days_with_any_logs.add(ed)
-            et = ex.type.lower().strip()
-            if et in NETWORK_TYPES:
-                network_raw += decay
-            if et in LEAD_TYPES:
-                lead_raw += decay
-
-        s_raw = _weighted_avg(skill_weighted)
-        s = saturate(s_raw, 2.0)
-        n = saturate(network_raw, 0.6)
-        l = saturate(lead_raw, 0.7)
-
-        e_raw = _weighted_avg(energy_weighted)
-        daily_energy_means = [sum(vs) / len(vs) for vs in energy_daily.values()]
-        var_penalty = clamp01(_variance(daily_energy_means) / 0.05)
-        e = clamp01(e_raw * (1 - 0.5 * var_penalty))
-
-        low_data = len(days_with_any_logs) < 5
+    for day, s_raw_d, n_raw_d, l_raw_d, e_raw_d, var_penalty_d, days_logged_d in zip(
+        all_days,
+        s_raw.tolist(),
+        network_raw.tolist(),
+        lead_raw.tolist(),
+        e_raw.tolist(),
+        var_penalty.tolist(),
+        days_logged.tolist(),
+    ):
+        s = _saturate_nonneg(s_raw_d, 2.0)
+        n = _saturate_nonneg(n_raw_d, 0.6)
+        l = _saturate_nonneg(l_raw_d, 0.7)
+        e = clamp01(e_raw_d * (1 - 0.5 * var_penalty_d))
+
+        low_data = days_logged_d < 5
         if low_data:
             s = s if s > 0 else 0.5
             n = n if n > 0 else 0.5
@@ -146,17 +394,17 @@ def compute_income_series(
             e = e if e > 0 else 0.5
 
         readiness = 100 * clamp01(settings.w_s * s + settings.w_n * n + settings.w_l * l + settings.w_e * e)
-        confidence = clamp01(math.log(1 + len(days_with_any_logs)) / math.log(1 + 30))
+        confidence = clamp01(math.log(1 + days_logged_d) / math.log(1 + 30))
 
         points.append(
             IncomePoint(
                 date=day,
-                s=round(s, 4),
-                n=round(n, 4),
-                l=round(l, 4),
-                e=round(e, 4),
-                readiness=round(readiness, 2),
-                confidence=round(confidence, 4),
+                s=s,
+                n=n,
+                l=l,
+                e=e,
+                readiness=readiness,
+                confidence=confidence,
                 low_data_confidence=low_data,
             )
         )
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
 from datetime import date, datetime, timedelta
 
-from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import select
+from sqlalchemy import Date, Row, case, func, insert, literal, null, select, union_all
 from sqlalchemy.orm import Session
 
-from .analytics import compute_summary
+from .analytics import compute_summary_from_aggregates
 from .database import Base, engine, get_db
-from .income_model import compute_income_series, get_or_create_settings
-from .models import Action, Exposure
+from .income_model import IncomePoint, compute_income_series, get_or_create_settings
+from .models import Action, Exposure, IncomeModelSettings
 from .schemas import (
     ActionCreate,
     ActionRead,
@@ -27,6 +31,10 @@ from .schemas import (
 )
 
 Base.metadata.create_all(bind=engine)
+# create_all skips tables that already exist, so indexes added to a model
+# later are created here for databases made before them.
+for index in Action.__table__.indexes:
+    index.create(bind=engine, checkfirst=True)
 
 app = FastAPI(title="Optionality Tracker API", version="0.2.0")
 
@@ -39,6 +47,24 @@ app.add_middleware(
 )
 
 
+INCOME_SERIES_CACHE_SIZE = 64
+_income_series_cache: OrderedDict[tuple, list[IncomePoint]] = OrderedDict()
+_write_generation = 0
+# Sync endpoints run in FastAPI's thread pool; guards the cache and generation.
+_cache_lock = threading.Lock()
+# Keeps ETags from one process run from matching after a restart resets _write_generation.
+_ETAG_SALT = uuid.uuid4().hex
+
+
+def _invalidate_analytics() -> None:
+    # Updates and delete-then-insert can leave count/max(id) unchanged, so every
+    # write endpoint drops the cached series and bumps the ETag generation.
+    global _write_generation
+    with _cache_lock:
+        _write_generation += 1
+        _income_series_cache.clear()
+
+
 @app.get("/health")
 def health() -> dict[str, str]:
     return {"status": "ok"}
@@ -60,6 +86,7 @@ def create_action(payload: ActionCreate, db: Session = Depends(get_db)) -> Actio
     )
     db.add(action)
     db.commit()
+    _invalidate_analytics()
     db.refresh(action)
     return action
 
@@ -97,6 +124,7 @@ def update_action(action_id: int, payload: ActionUpdate, db: Session = Depends(g
         setattr(action, field, getattr(payload, field))
     action.o_delta = payload.h + payload.r - payload.d + payload.e
     db.commit()
+    _invalidate_analytics()
     db.refresh(action)
     return action
 
@@ -108,6 +136,7 @@ def delete_action(action_id: int, db: Session = Depends(get_db)) -> dict[str, bo
         raise HTTPException(status_code=404, detail="Action not found")
     db.delete(action)
     db.commit()
+    _invalidate_analytics()
     return {"deleted": True}
 
 
@@ -116,6 +145,7 @@ def create_exposure(payload: ExposureCreate, db: Session = Depends(get_db)) -> E
     exposure = Exposure(occurred_at=payload.occurred_at, type=payload.type, notes=payload.notes)
     db.add(exposure)
     db.commit()
+    _invalidate_analytics()
     db.refresh(exposure)
     return exposure
 
@@ -141,6 +171,7 @@ def delete_exposure(exposure_id: int, db: Session = Depends(get_db)) -> dict[str
         raise HTTPException(status_code=404, detail="Exposure not found")
     db.delete(exposure)
     db.commit()
+    _invalidate_analytics()
     return {"deleted": True}
 
 
@@ -163,10 +194,95 @@ def update_income_model_settings(payload: IncomeModelSettingsUpdate, db: Session
     return settings
 
 
+def _fetch_income_events(db: Session, start_dt: datetime, end_dt: datetime) -> tuple[list[Row], list[Row]]:
+    # One round trip for both tables: a discriminated UNION ALL of only the
+    # columns compute_income_series reads, split back into actions/exposures.
+    action_events = select(
+        literal("action").label("kind"),
+        Action.occurred_at,
+        Action.h,
+        Action.e,
+        null().label("type"),
+    ).where(Action.occurred_at >= start_dt, Action.occurred_at < end_dt)
+    exposure_events = select(
+        literal("exposure").label("kind"),
+        Exposure.occurred_at,
+        null().label("h"),
+        null().label("e"),
+        Exposure.type,
+    ).where(Exposure.occurred_at >= start_dt, Exposure.occurred_at < end_dt)
+
+    actions: list[Row] = []
+    exposures: list[Row] = []
+    # Stream the cursor in batches rather than buffering the whole result first.
+    for row in db.execute(union_all(action_events, exposure_events)).yield_per(500):
+        (actions if row.kind == "action" else exposures).append(row)
+    return actions, exposures
+
+
+def _events_version(db: Session) -> tuple:
+    return tuple(
+        db.execute(
+            select(
+                select(func.count(Action.id)).scalar_subquery(),
+                select(func.max(Action.id)).scalar_subquery(),
+                select(func.count(Exposure.id)).scalar_subquery(),
+                select(func.max(Exposure.id)).scalar_subquery(),
+            )
+        ).one()
+    )
+
+
+def _analytics_etag(db: Session, endpoint: str, start_date: date, end_date: date) -> str:
+    settings = get_or_create_settings(db)
+    version = (
+        f"{_ETAG_SALT}:{_write_generation}:{endpoint}:{_events_version(db)}:"
+        f"{settings.updated_at.timestamp()}:{start_date}:{end_date}"
+    )
+    return f'"{hashlib.sha1(version.encode()).hexdigest()[:16]}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags or "*" in tags
+
+
+def _income_series(db: Session, start_date: date, end_date: date) -> tuple[IncomeModelSettings, list[IncomePoint]]:
+    # Shared by /series and /summary so a dashboard refresh computes the
+    # series once; keyed on the settings revision and the event tables' state.
+    # Read the generation once, up front: if a write lands while this series is
+    # computed from the pre-write rows, the generation moves past the key and
+    # the stale result is not stored.
+    generation = _write_generation
+    settings = get_or_create_settings(db)
+    key = (generation, start_date, end_date, settings.updated_at, _events_version(db))
+    with _cache_lock:
+        points = _income_series_cache.get(key)
+        if points is not None:
+            _income_series_cache.move_to_end(key)
+    if points is not None:
+        return settings, points
+
+    fetch_start = datetime.combine(start_date - timedelta(days=59), datetime.min.time())
+    fetch_end = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+    actions, exposures = _fetch_income_events(db, fetch_start, fetch_end)
+    points = compute_income_series(actions, exposures, start_date, end_date, settings)
+
+    with _cache_lock:
+        if generation == _write_generation:
+            _income_series_cache[key] = points
+            if len(_income_series_cache) > INCOME_SERIES_CACHE_SIZE:
+                _income_series_cache.popitem(last=False)
+    return settings, points
+
+
 @app.get("/api/income-model/series", response_model=IncomeModelSeriesResponse)
 def income_model_series(
     start: date | None = Query(default=None),
     end: date | None = Query(default=None),
+    if_none_match: str | None = Header(default=None),
     db: Session = Depends(get_db),
 ):
     end_date = end or date.today()
@@ -174,51 +290,81 @@ def income_model_series(
     if end_date < start_date:
         raise HTTPException(status_code=400, detail="end must be on or after start")
 
-    settings = get_or_create_settings(db)
-    fetch_start = datetime.combine(start_date - timedelta(days=59), datetime.min.time())
-    fetch_end = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
-    actions = list(db.scalars(select(Action).where(Action.occurred_at >= fetch_start, Action.occurred_at < fetch_end)).all())
-    exposures = list(db.scalars(select(Exposure).where(Exposure.occurred_at >= fetch_start, Exposure.occurred_at < fetch_end)).all())
+    etag = _analytics_etag(db, "series", start_date, end_date)
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
 
-    points = compute_income_series(actions, exposures, start_date, end_date, settings)
-    daily = [IncomeModelPoint(**p.__dict__) for p in points]
+    settings, points = _income_series(db, start_date, end_date)
+    # Points and settings come from our own model code and the ORM, already
+    # correctly typed. Constructing without validation only pays off because the
+    # body is serialized here: returning the model would make FastAPI dump and
+    # re-validate it against response_model anyway.
+    daily = [IncomeModelPoint.model_construct(**p._asdict()) for p in points]
     explanations = [
         "S uses decayed positive H and E from actions, then saturation.",
         "N uses decayed network-oriented exposures: outreach/interview/proposal/post/portfolio_update.",
         "L uses decayed lead-oriented exposures: application/outreach/proposal/post.",
         "E uses decayed E score signal with variance penalty for stability.",
     ]
-    return IncomeModelSeriesResponse(
+    body = IncomeModelSeriesResponse.model_construct(
         daily=daily,
         current=daily[-1] if daily else None,
-        settings=IncomeModelSettingsRead.model_validate(settings),
+        settings=IncomeModelSettingsRead.model_construct(
+            **{field: getattr(settings, field) for field in IncomeModelSettingsRead.model_fields}
+        ),
         explanations=explanations,
     )
+    return Response(content=body.model_dump_json(), media_type="application/json", headers={"ETag": etag})
 
 
 @app.get("/api/analytics/summary", response_model=AnalyticsSummary)
 def analytics_summary(
+    response: Response,
     start: date | None = Query(default=None),
     end: date | None = Query(default=None),
+    if_none_match: str | None = Header(default=None),
     db: Session = Depends(get_db),
-) -> AnalyticsSummary:
+) -> AnalyticsSummary | Response:
     end_date = end or date.today()
     start_date = start or (end_date - timedelta(days=29))
     if end_date < start_date:
         raise HTTPException(status_code=400, detail="end must be on or after start")
 
+    etag = _analytics_etag(db, "summary", start_date, end_date)
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
     start_dt = datetime.combine(start_date, datetime.min.time())
     end_dt = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
-    actions = list(db.scalars(select(Action).where(Action.occurred_at >= start_dt, Action.occurred_at < end_dt)).all())
-    exposures = list(db.scalars(select(Exposure).where(Exposure.occurred_at >= start_dt, Exposure.occurred_at < end_dt)).all())
 
-    settings = get_or_create_settings(db)
-    income_points = compute_income_series(actions, exposures, start_date, end_date, settings)
+    # Daily sums and weekly exposure counts are aggregated by SQLite.
+    action_day = func.date(Action.occurred_at, type_=Date)
+    daily_rows = db.execute(
+        select(
+            action_day,
+            func.sum(Action.o_delta),
+            func.sum(case((Action.o_delta < 0, Action.o_delta), else_=0)),
+            func.sum(2 - Action.r),
+            func.count(),
+        )
+        .where(Action.occurred_at >= start_dt, Action.occurred_at < end_dt)
+        .group_by(action_day)
+    ).all()
+    # SQLite: advance to the next Sunday (weekday 0), then back to that week's Monday.
+    exposure_week = func.date(Exposure.occurred_at, "weekday 0", "-6 days", type_=Date)
+    weekly_rows = db.execute(
+        select(exposure_week, func.count())
+        .where(Exposure.occurred_at >= start_dt, Exposure.occurred_at < end_dt)
+        .group_by(exposure_week)
+    ).all()
+
+    _, income_points = _income_series(db, start_date, end_date)
     latest = income_points[-1] if income_points else None
     capitals = CapitalsLatest(s=latest.s, n=latest.n, l=latest.l, e=latest.e) if latest else CapitalsLatest()
-    return compute_summary(
-        actions=actions,
-        exposures=exposures,
+    return compute_summary_from_aggregates(
+        daily_rows=daily_rows,
+        weekly_rows=weekly_rows,
         start=start_date,
         end=end_date,
         readiness_latest=latest.readiness if latest else 0.0,
@@ -233,13 +379,14 @@ def seed_demo_data(db: Session = Depends(get_db)) -> SeedResponse:
     domains = ["income", "sleep", "nutrition", "movement", "stress", "social"]
     exposure_types = ["application", "outreach", "post", "proposal", "interview", "portfolio_update"]
 
+    actions_rows = []
     for i in range(20):
         h = (i % 5) - 2
         r = ((i + 1) % 5) - 2
         d = ((i + 2) % 5) - 2
         e = ((i + 3) % 5) - 2
-        db.add(
-            Action(
+        actions_rows.append(
+            dict(
                 occurred_at=now - timedelta(days=19 - i),
                 domain=domains[i % len(domains)],
                 title=f"Sample action {i + 1}",
@@ -253,14 +400,17 @@ def seed_demo_data(db: Session = Depends(get_db)) -> SeedResponse:
             )
         )
 
-    for i in range(12):
-        db.add(
-            Exposure(
-                occurred_at=now - timedelta(days=i * 2),
-                type=exposure_types[i % len(exposure_types)],
-                notes="Seeded demo exposure",
-            )
+    exposures_rows = [
+        dict(
+            occurred_at=now - timedelta(days=i * 2),
+            type=exposure_types[i % len(exposure_types)],
+            notes="Seeded demo exposure",
         )
+        for i in range(12)
+    ]
 
+    db.execute(insert(Action), actions_rows)
+    db.execute(insert(Exposure), exposures_rows)
     db.commit()
-    return SeedResponse(inserted_actions=20, inserted_exposures=12)
+    _invalidate_analytics()
+    return SeedResponse(inserted_actions=len(actions_rows), inserted_exposures=len(exposures_rows))
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer
 
 Domain = Literal["income", "sleep", "nutrition", "movement", "stress", "social"]
 
@@ -70,6 +70,10 @@ class CapitalsLatest(BaseModel):
     l: float = 0.0
     e: float = 0.0
 
+    @field_serializer("s", "n", "l", "e")
+    def _round_capital(self, value: float) -> float:
+        return round(value, 4)
+
 
 class AnalyticsTotals(BaseModel):
     sum_o_delta: int
@@ -126,6 +130,15 @@ class IncomeModelPoint(BaseModel):
     confidence: float
     low_data_confidence: bool
 
+    # The income model emits raw floats; round once when the response is serialized.
+    @field_serializer("s", "n", "l", "e", "confidence")
+    def _round_capital(self, value: float) -> float:
+        return round(value, 4)
+
+    @field_serializer("readiness")
+    def _round_readiness(self, value: float) -> float:
+        return round(value, 2)
+
 
 class IncomeModelSeriesResponse(BaseModel):
     daily: list[IncomeModelPoint]
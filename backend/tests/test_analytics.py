@@ -2,7 +2,14 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
+from fastapi import Response
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
 from app.analytics import compute_summary
+from app.database import Base
+from app.main import analytics_summary
 from app.models import Action, Exposure
 
 
@@ -55,3 +62,37 @@ def test_irreversibility_average_per_day():
     actions = [mk_action("2024-01-01", 0, -2), mk_action("2024-01-01", 0, 2)]
     summary = compute_summary(actions, [], start=date(2024, 1, 1), end=date(2024, 1, 1))
     assert summary.daily[0].irreversibility_avg == 2.0
+
+
+def test_sql_aggregated_summary_matches_python():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    actions = [
+        mk_action("2024-01-01", 3, 1),
+        mk_action("2024-01-01", -5, -2),
+        mk_action("2024-01-03", -1, -1),
+        mk_action("2024-01-08", -4, 2),
+        mk_action("2024-01-14", 2, 0),
+    ]
+    exposures = [mk_exposure("2024-01-02"), mk_exposure("2024-01-07"), mk_exposure("2024-01-08"), mk_exposure("2024-01-14")]
+    expected = compute_summary(actions, exposures, start=date(2024, 1, 1), end=date(2024, 1, 14))
+
+    with Session(engine) as db:
+        db.add_all(actions + exposures)
+        db.commit()
+        summary = analytics_summary(
+            Response(), start=date(2024, 1, 1), end=date(2024, 1, 14), if_none_match=None, db=db
+        )
+        from_rows = compute_summary(
+            db.execute(select(Action.occurred_at, Action.o_delta, Action.r)).all(),
+            db.execute(select(Exposure.occurred_at)).all(),
+            start=date(2024, 1, 1),
+            end=date(2024, 1, 14),
+        )
+
+    assert from_rows == expected
+
+    assert summary.daily == expected.daily
+    assert summary.weekly_exposure == expected.weekly_exposure
+    assert summary.totals.sum_o_delta == expected.totals.sum_o_delta
+    assert summary.totals.exposure_count_period == 4
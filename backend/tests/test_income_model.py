@@ -3,10 +3,26 @@ from __future__ import annotations
 from datetime import date, datetime
 
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from app.income_model import clamp01, compute_income_series, decay_factor, saturate
+import numpy as np
+import pytest
+
+from app.income_model import (
+    _accumulate_loops,
+    _accumulate_vectorized,
+    clamp01,
+    compute_income_series,
+    decay_factor,
+    saturate,
+)
+from app import main
+from app.database import Base, get_db
 from app.main import app
 from app.models import Action, Exposure, IncomeModelSettings
+from app.schemas import IncomeModelPoint
 
 
 def test_decay_factor_half_life():
@@ -42,6 +58,66 @@ def test_low_data_defaults_and_confidence():
     assert 0 <= points[-1].readiness <= 100
 
 
+def test_series_window_and_decay():
+    settings = IncomeModelSettings(
+        id=1,
+        target_daily_income=200,
+        w_s=0.25,
+        w_n=0.25,
+        w_l=0.25,
+        w_e=0.25,
+        half_life_days=21,
+        exposure_goal_per_week=5,
+        updated_at=datetime.utcnow(),
+    )
+    actions = [
+        Action(occurred_at=datetime(2024, 1, 1, 12), domain="income", title="x", h=2, r=0, d=0, e=2, o_delta=4),
+    ]
+    exposures = [Exposure(occurred_at=datetime(2024, 1, 1, 9), type=" Post ", notes=None)]
+    points = compute_income_series(actions, exposures, date(2024, 1, 1), date(2024, 3, 1), settings)
+
+    first = points[0]
+    assert first.s == pytest.approx(saturate(1.0, 2.0))
+    assert first.n == pytest.approx(saturate(1.0, 0.6))
+    assert first.l == pytest.approx(saturate(1.0, 0.7))
+    assert points[21].n == pytest.approx(saturate(0.5, 0.6))
+    # day 60 falls outside the 60-day window, so only low-data defaults remain
+    assert points[60].n == 0.5
+    assert points[60].confidence == 0.0
+
+
+def test_accumulate_kernels_agree():
+    rng = np.random.default_rng(7)
+    day_ords = np.arange(738900, 738960, dtype=np.int64)
+    action_days = np.sort(rng.integers(738850, 738960, size=200)).astype(np.int64)
+    action_h = rng.integers(-2, 3, size=200).astype(np.int64)
+    action_e = rng.integers(-2, 3, size=200).astype(np.int64)
+    exposure_days = np.sort(rng.integers(738850, 738960, size=50)).astype(np.int64)
+    exposure_is_network = rng.random(50) < 0.5
+    exposure_is_lead = rng.random(50) < 0.5
+    decay_lut = np.array([decay_factor(d, 21) for d in range(61)])
+    args = (day_ords, action_days, action_h, action_e, exposure_days, exposure_is_network, exposure_is_lead, decay_lut)
+
+    for loops, vectorized in zip(_accumulate_loops(*args), _accumulate_vectorized(*args)):
+        np.testing.assert_allclose(loops, vectorized, atol=1e-9)
+
+
+def test_income_point_rounded_on_serialization():
+    point = IncomeModelPoint(
+        date=date(2024, 1, 1),
+        s=0.123456,
+        n=0.5,
+        l=0.99999,
+        e=0.0,
+        readiness=55.5555,
+        confidence=0.333333,
+        low_data_confidence=False,
+    )
+    dumped = point.model_dump()
+    assert (dumped["s"], dumped["l"], dumped["readiness"], dumped["confidence"]) == (0.1235, 1.0, 55.56, 0.3333)
+    assert point.s == 0.123456
+
+
 def test_weight_sum_validation_endpoint():
     client = TestClient(app)
     res = client.put(
@@ -64,3 +140,78 @@ def test_clamp01():
     assert clamp01(-1) == 0
     assert clamp01(0.3) == 0.3
     assert clamp01(9) == 1
+
+
+def test_series_etag_not_modified_until_write():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        params = {"start": "2024-01-01", "end": "2024-01-31"}
+        first = client.get("/api/income-model/series", params=params)
+        etag = first.headers["ETag"]
+
+        cached = client.get("/api/income-model/series", params=params, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        summary = client.get("/api/analytics/summary", params=params, headers={"If-None-Match": etag})
+        assert summary.status_code == 200
+
+        client.post("/api/exposures", json={"occurred_at": "2024-01-10T09:00:00", "type": "post"})
+        changed = client.get("/api/income-model/series", params=params, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+def test_series_cache_skips_result_computed_before_a_write(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        params = {"start": "2024-01-01", "end": "2024-01-31"}
+        action = {"occurred_at": "2024-01-10T09:00:00", "title": "ship", "h": 2, "r": 0, "d": 0, "e": 2}
+        action_id = client.post("/api/actions", json=action).json()["id"]
+
+        fetch = main._fetch_income_events
+
+        def fetch_then_update(db, start, end):
+            # An in-place update lands after this request has read its rows.
+            rows = fetch(db, start, end)
+            with session_factory() as other:
+                row = other.get(Action, action_id)
+                row.h, row.e, row.o_delta = 0, 0, 0
+                other.commit()
+            main._invalidate_analytics()
+            return rows
+
+        monkeypatch.setattr(main, "_fetch_income_events", fetch_then_update)
+        client.get("/api/income-model/series", params=params)
+        monkeypatch.setattr(main, "_fetch_income_events", fetch)
+
+        after_write = client.get("/api/income-model/series", params=params).json()["current"]
+        main._invalidate_analytics()
+        fresh = client.get("/api/income-model/series", params=params).json()["current"]
+        assert after_write == fresh
+    finally:
+        app.dependency_overrides.pop(get_db, None)
@@ -23,15 +23,26 @@ from __future__ import annotations
 
 import argparse
 import json
-from dataclasses import dataclass, replace
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields, replace
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+import matplotlib
+
+matplotlib.use("Agg")  # figures are only written to files; skip GUI backend probing
 import matplotlib.pyplot as plt
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the pure-Python integrator
+    njit = None
 
-@dataclass
+
+@dataclass(slots=True)
 class SimulationParams:
     """Model parameters and solver controls."""
 
@@ -56,7 +67,7 @@ class SimulationParams:
     seed: int = 42
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationState:
     """Dynamic state variables."""
 
@@ -80,95 +91,180 @@ class SimulationResult:
     classification: str
 
 
-def compute_omega(H: np.ndarray, D: np.ndarray, R: np.ndarray) -> np.ndarray:
-    """Resilience metric Omega = H * (1 / (1 + D)) * (1 / (1 + R))."""
+def compute_omega(
+    H: np.ndarray, D: np.ndarray, R: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    """Resilience metric Omega = H * (1 / (1 + D)) * (1 / (1 + R)).
+
+    Pass ``out`` to write the result into an existing array.
+    """
+
+    den = np.add(D, 1.0)
+    den *= np.add(R, 1.0)
+    return np.divide(H, den, out=out)
 
-    return H / ((1.0 + D) * (1.0 + R))
+
+ATTRACTOR_NAMES = (
+    "monoculture collapse",
+    "resilient diversity regime",
+    "lock-in attractor",
+    "stable mixed attractor",
+    "oscillatory / transitional",
+)
 
 
 def classify_attractor(result: SimulationResult) -> str:
     """Classify terminal behavior into the requested attractor categories."""
 
     tail = slice(int(0.8 * len(result.H)), None)
-    H_tail = result.H[tail]
-    D_tail = result.D[tail]
-    R_tail = result.R[tail]
+    return ATTRACTOR_NAMES[int(_classify_codes(result.H[tail], result.D[tail], result.R[tail]))]
+
+
+def _mean_var(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and population variance along axis 0 of float32 trajectories, in float64."""
+
+    x = np.asarray(x, dtype=np.float64)
+    mean = x.sum(axis=0) / len(x)
+    dev = x - mean
+    return mean, (dev * dev).sum(axis=0) / len(x)
+
+
+def _classify_codes(H_tail: np.ndarray, D_tail: np.ndarray, R_tail: np.ndarray) -> np.ndarray:
+    """Attractor codes (indices into ATTRACTOR_NAMES) for tails running along axis 0.
+
+    Works on a single run's 1-D tails or a whole sweep tile at once.
+    """
+
+    H_mean, H_var = _mean_var(H_tail)
+    D_mean, D_var = _mean_var(D_tail)
+    R_mean, R_var = _mean_var(R_tail)
+
+    # Std of the pooled H/D/R tail values: mean of the per-series variances
+    # plus the variance of their means (equal lengths), without stacking.
+    grand_mean = (H_mean + D_mean + R_mean) / 3.0
+    tail_var = (
+        H_var + D_var + R_var
+        + (H_mean - grand_mean) ** 2
+        + (D_mean - grand_mean) ** 2
+        + (R_mean - grand_mean) ** 2
+    ) / 3.0
+    tail_std = np.sqrt(tail_var)
+
+    # Conditions are checked in priority order; the first match wins.
+    return np.select(
+        [
+            (H_mean < 0.35) & (D_mean > 2.0),
+            (H_mean > 1.0) & (D_mean < 1.2) & (R_mean < 1.2),
+            (D_mean > 1.6) & (R_mean > 1.4),
+            tail_std < 0.04,
+        ],
+        [0, 1, 2, 3],
+        default=4,
+    )
 
-    H_mean = float(np.mean(H_tail))
-    D_mean = float(np.mean(D_tail))
-    R_mean = float(np.mean(R_tail))
 
-    tail_std = float(np.std(np.column_stack([H_tail, D_tail, R_tail])))
+def _draw_noise(p: SimulationParams, seed: int | np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray]:
+    """Draw a run's shock mask and per-step noise rows (H, D, R, c) from ``seed``.
+
+    Everything is drawn up front instead of dispatching scalar RNG calls from
+    every step, and normals are only drawn for the steps that shock; step 0 is
+    the initial state and never carries a shock.
+    """
+
+    n = p.steps
+    rng = np.random.default_rng(seed)
+    shocks = np.empty(n + 1, dtype=bool)
+    shocks[0] = False
+    shocks[1:] = rng.random(n) < p.shock_prob
+    scales = p.shock_scale * np.array([1.0, 0.6, 0.5, 0.4])
+    noise = np.zeros((4, n + 1))
+    noise[:, shocks] = rng.standard_normal((4, int(np.count_nonzero(shocks)))) * scales[:, None]
+    noise[2] = np.abs(noise[2])
+    return shocks, noise
+
+
+def _coefficients(p: SimulationParams) -> Tuple[float, ...]:
+    """Step-invariant terms of the derivatives, flattened for the integrators."""
+
+    return tuple(float(v) for v in (
+        p.alpha_noise,
+        p.beta,
+        p.gamma,
+        p.delta * p.decay,
+        p.epsilon,
+        p.zeta * p.exploration,
+        p.eta * p.institutional_pressure - p.theta * p.fragmentation,
+        p.adaptive_rate,
+        p.entropy_floor,
+        p.dt,
+    ))
+
+
+def _integrate_loop(coeffs, c0, H0, D0, R0, noise):
+    """Euler-integrate the state from pre-drawn per-step noise rows (H, D, R, c)."""
+
+    alpha_noise, beta, gamma, dD_base, epsilon, dR_base, dc_base, adaptive_rate, entropy_floor, dt = coeffs
+    noise_H = noise[0]
+    noise_D = noise[1]
+    noise_R = noise[2]
+    noise_c = noise[3]
+    n = len(noise_H) - 1
+    adaptive_boost = dt * adaptive_rate * 0.5
+
+    # Integrate on float64 locals, store trajectories as float32. Every slot
+    # is written below, so the outputs need no zero-fill.
+    c = np.empty(n + 1, dtype=np.float32)
+    H = np.empty(n + 1, dtype=np.float32)
+    D = np.empty(n + 1, dtype=np.float32)
+    R = np.empty(n + 1, dtype=np.float32)
+    omega = np.empty(n + 1, dtype=np.float32)
+
+    c_i, H_i, D_i, R_i = c0, H0, D0, R0
+    c[0], H[0], D[0], R[0] = c_i, H_i, D_i, R_i
+    omega[0] = H_i / ((1.0 + D_i) * (1.0 + R_i))
+
+    for i in range(1, n + 1):
+        adaptive_adjust = adaptive_rate * max(0.0, entropy_floor - H_i)
+
+        dHdt = alpha_noise - beta * c_i * D_i + noise_H[i]
+        dDdt = gamma * c_i * H_i - dD_base + noise_D[i]
+        dRdt = epsilon * D_i - dR_base + noise_R[i]
+        dcdt = dc_base + adaptive_adjust + noise_c[i]
+
+        prev_H = H_i
+        c_i = max(0.0, c_i + dt * dcdt)
+        H_i = max(0.0, H_i + dt * dHdt)
+        D_i = max(0.0, D_i + dt * dDdt)
+        R_i = max(0.0, R_i + dt * dRdt)
 
-    if H_mean < 0.35 and D_mean > 2.0:
-        return "monoculture collapse"
-    if H_mean > 1.0 and D_mean < 1.2 and R_mean < 1.2:
-        return "resilient diversity regime"
-    if D_mean > 1.6 and R_mean > 1.4:
-        return "lock-in attractor"
-    if tail_std < 0.04:
-        return "stable mixed attractor"
-    return "oscillatory / transitional"
+        # additional adaptive correction if entropy is actively declining
+        c_i += adaptive_boost * (H_i < prev_H)
 
+        c[i], H[i], D[i], R[i] = c_i, H_i, D_i, R_i
+        # Omega is fused into the step rather than recomputed over the arrays.
+        omega[i] = H_i / ((1.0 + D_i) * (1.0 + R_i))
 
-def step_dynamics(
-    state: SimulationState,
-    p: SimulationParams,
-    rng: np.random.Generator,
-    prev_H: float,
-) -> Tuple[SimulationState, bool]:
-    """Advance one discrete timestep with adaptive coupling and stochastic shocks."""
-
-    adaptive_adjust = p.adaptive_rate * max(0.0, p.entropy_floor - state.H)
-
-    dHdt = p.alpha_noise - p.beta * state.c * state.D
-    dDdt = p.gamma * state.c * state.H - p.delta * p.decay
-    dRdt = p.epsilon * state.D - p.zeta * p.exploration
-    dcdt = p.eta * p.institutional_pressure - p.theta * p.fragmentation + adaptive_adjust
-
-    shock = rng.random() < p.shock_prob
-    if shock:
-        dHdt += rng.normal(0.0, p.shock_scale)
-        dDdt += rng.normal(0.0, p.shock_scale * 0.6)
-        dRdt += abs(rng.normal(0.0, p.shock_scale * 0.5))
-        dcdt += rng.normal(0.0, p.shock_scale * 0.4)
-
-    new_state = SimulationState(
-        c=max(0.0, state.c + p.dt * dcdt),
-        H=max(0.0, state.H + p.dt * dHdt),
-        D=max(0.0, state.D + p.dt * dDdt),
-        R=max(0.0, state.R + p.dt * dRdt),
-    )
+    return c, H, D, R, omega
 
-    if new_state.H < prev_H:
-        # additional adaptive correction if entropy is actively declining
-        new_state.c += p.dt * p.adaptive_rate * 0.5
 
-    return new_state, shock
+if njit is not None:
+    _integrate = njit(cache=True, fastmath=True)(_integrate_loop)
+else:
+
+    def _integrate(coeffs, c0, H0, D0, R0, noise):
+        # Python floats index far faster than ndarray scalars in the interpreter.
+        return _integrate_loop(coeffs, c0, H0, D0, R0, noise.tolist())
 
 
 def run_simulation(params: SimulationParams, initial: SimulationState) -> SimulationResult:
     """Run the ecosystem simulation using Euler integration."""
 
-    rng = np.random.default_rng(params.seed)
-
-    t = np.arange(params.steps + 1) * params.dt
-    c = np.zeros(params.steps + 1)
-    H = np.zeros(params.steps + 1)
-    D = np.zeros(params.steps + 1)
-    R = np.zeros(params.steps + 1)
-    shocks = np.zeros(params.steps + 1, dtype=bool)
-
-    state = initial
-    c[0], H[0], D[0], R[0] = state.c, state.H, state.D, state.R
-
-    for i in range(1, params.steps + 1):
-        prev_H = state.H
-        state, shock = step_dynamics(state, params, rng, prev_H)
-        c[i], H[i], D[i], R[i] = state.c, state.H, state.D, state.R
-        shocks[i] = shock
+    t = (np.arange(params.steps + 1) * params.dt).astype(np.float32)
+    shocks, noise = _draw_noise(params, params.seed)
+    c, H, D, R, omega = _integrate(
+        _coefficients(params), float(initial.c), float(initial.H), float(initial.D), float(initial.R), noise
+    )
 
-    omega = compute_omega(H, D, R)
     provisional = SimulationResult(t, c, H, D, R, omega, shocks, "")
     classification = classify_attractor(provisional)
 
@@ -202,36 +298,175 @@ def plot_trajectories(result: SimulationResult, out_path: Path) -> None:
     plt.close(fig)
 
 
+# Noise buffer budget per sweep tile. Bounds sweep memory regardless of grid
+# size; much smaller tiles lose more to NumPy per-call overhead than they
+# gain in locality.
+SWEEP_TILE_BYTES = 16 << 20
+
+
+def _integrate_tile(
+    p: SimulationParams,
+    initial: SimulationState,
+    noise_values: np.ndarray,
+    c_values: np.ndarray,
+    seeds: np.ndarray,
+    noise_buf: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Integrate one sweep tile in lockstep as (noise, c0) state arrays.
+
+    Every cell draws its noise from its own entry of ``seeds`` the same way
+    ``run_simulation`` does, so the tile reproduces independent per-cell runs;
+    only the tail needed for Omega and classification is kept. ``noise_buf``
+    is reused across tiles.
+    """
+
+    n = p.steps
+    shape = (len(noise_values), len(c_values))
+    _, beta, gamma, dD_base, epsilon, dR_base, dc_base, adaptive_rate, entropy_floor, dt = _coefficients(p)
+    adaptive_boost = dt * adaptive_rate * 0.5
+
+    # Time-major so each step reads one contiguous (4, rows, cols) slab.
+    noise = noise_buf[:, :, : shape[0], : shape[1]]
+    for a in range(shape[0]):
+        for b in range(shape[1]):
+            noise[:, :, a, b] = _draw_noise(p, seeds[a, b])[1].T
+
+    alpha = np.asarray(noise_values, dtype=float)[:, None]
+    c = np.repeat(np.asarray(c_values, dtype=float)[None, :], shape[0], axis=0)
+    H = np.full(shape, float(initial.H))
+    D = np.full(shape, float(initial.D))
+    R = np.full(shape, float(initial.R))
+
+    tail_start = int(0.8 * (n + 1))
+    keep_from = max(0, min(tail_start, n + 1 - 100))
+    H_hist = np.empty((n + 1 - keep_from,) + shape, dtype=np.float32)
+    D_hist = np.empty_like(H_hist)
+    R_hist = np.empty_like(H_hist)
+    omega_from = max(0, n + 1 - 100)
+    omega_hist = np.empty((n + 1 - omega_from,) + shape, dtype=np.float32)
+    if keep_from == 0:
+        H_hist[0], D_hist[0], R_hist[0] = H, D, R
+    if omega_from == 0:
+        compute_omega(H, D, R, out=omega_hist[0])
+
+    for i in range(1, n + 1):
+        noise_H, noise_D, noise_R, noise_c = noise[i]
+        adaptive_adjust = adaptive_rate * np.maximum(0.0, entropy_floor - H)
+
+        dHdt = alpha - beta * c * D + noise_H
+        dDdt = gamma * c * H - dD_base + noise_D
+        dRdt = epsilon * D - dR_base + noise_R
+        dcdt = dc_base + adaptive_adjust + noise_c
+
+        prev_H = H
+        c = np.maximum(0.0, c + dt * dcdt)
+        H = np.maximum(0.0, H + dt * dHdt)
+        D = np.maximum(0.0, D + dt * dDdt)
+        R = np.maximum(0.0, R + dt * dRdt)
+
+        # additional adaptive correction if entropy is actively declining
+        c += adaptive_boost * (H < prev_H)
+
+        if i >= keep_from:
+            H_hist[i - keep_from], D_hist[i - keep_from], R_hist[i - keep_from] = H, D, R
+        if i >= omega_from:
+            compute_omega(H, D, R, out=omega_hist[i - omega_from])
+
+    omega_tail = np.mean(omega_hist, axis=0, dtype=np.float64)
+
+    tail = slice(tail_start - keep_from, None)
+    class_tile = _classify_codes(H_hist[tail], D_hist[tail], R_hist[tail])
+
+    return omega_tail, class_tile
+
+
+def _tile_shape(steps: int, rows: int, cols: int) -> Tuple[int, int]:
+    """Largest near-square tile whose noise buffer fits in SWEEP_TILE_BYTES."""
+
+    cells = max(1, SWEEP_TILE_BYTES // ((steps + 1) * 4 * 8))
+    tile_n = max(1, min(rows, math.isqrt(cells)))
+    tile_c = max(1, min(cols, cells // tile_n))
+    return tile_n, tile_c
+
+
+def _sweep_block(
+    job: Tuple[int, SimulationParams, SimulationState, np.ndarray, np.ndarray, np.ndarray],
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    """Integrate a block of sweep rows tile by tile, sharing one noise buffer."""
+
+    i0, p, initial, noise_values, c_values, seeds = job
+    rows, cols = len(noise_values), len(c_values)
+    tile_n, tile_c = _tile_shape(p.steps, rows, cols)
+    noise_buf = np.empty((p.steps + 1, 4, tile_n, tile_c))
+
+    omega_block = np.empty((rows, cols))
+    class_block = np.empty((rows, cols))
+    for r0 in range(0, rows, tile_n):
+        for c0 in range(0, cols, tile_c):
+            rs, cs = slice(r0, r0 + tile_n), slice(c0, c0 + tile_c)
+            omega_block[rs, cs], class_block[rs, cs] = _integrate_tile(
+                p, initial, noise_values[rs], c_values[cs], seeds[rs, cs], noise_buf
+            )
+
+    return i0, omega_block, class_block
+
+
 def parameter_sweep(
     base: SimulationParams,
     initial: SimulationState,
     c_values: np.ndarray,
     noise_values: np.ndarray,
+    workers: int | None = None,
 ) -> Tuple[np.ndarray, np.ndarray]:
-    """Sweep initial coupling and alpha_noise to build phase diagrams."""
-
-    omega_grid = np.zeros((len(noise_values), len(c_values)))
-    class_grid = np.zeros((len(noise_values), len(c_values)))
-
-    labels = {
-        "monoculture collapse": 0,
-        "resilient diversity regime": 1,
-        "lock-in attractor": 2,
-        "stable mixed attractor": 3,
-        "oscillatory / transitional": 4,
-    }
-
-    for i, noise in enumerate(noise_values):
-        for j, c0 in enumerate(c_values):
-            p = replace(base, alpha_noise=float(noise), seed=base.seed + i * 1000 + j)
-            init = replace(initial, c=float(c0))
-            res = run_simulation(p, init)
-            omega_grid[i, j] = np.mean(res.omega[-100:])
-            class_grid[i, j] = labels[res.classification]
+    """Sweep initial coupling and alpha_noise to build phase diagrams.
+
+    The grid is integrated as whole arrays rather than one run per cell, with
+    row blocks spread over ``workers`` processes (all cores by default);
+    ``workers=1`` runs in-process. Each cell gets an independent child of
+    ``SeedSequence(base.seed)``, so results do not depend on how the grid is
+    split across workers.
+    """
+
+    omega_grid = np.empty((len(noise_values), len(c_values)))
+    class_grid = np.empty((len(noise_values), len(c_values)))
+
+    seeds = np.empty(omega_grid.shape, dtype=object)
+    seeds.flat[:] = np.random.SeedSequence(base.seed).spawn(seeds.size)
+
+    n_workers = min(workers or os.cpu_count() or 1, max(1, len(noise_values)))
+    bounds = np.linspace(0, len(noise_values), n_workers + 1).astype(int)
+    jobs = [
+        (int(i0), base, initial, noise_values[i0:i1], c_values, seeds[i0:i1])
+        for i0, i1 in zip(bounds[:-1], bounds[1:])
+        if i1 > i0
+    ]
+
+    if n_workers == 1:
+        results = list(map(_sweep_block, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(_sweep_block, jobs))
+
+    for i0, omega_block, class_block in results:
+        omega_grid[i0:i0 + len(omega_block)] = omega_block
+        class_grid[i0:i0 + len(class_block)] = class_block
 
     return omega_grid, class_grid
 
 
+_phase_fig = None
+
+
+def _phase_figure():
+    """Return the figure shared by phase-diagram plots, cleared for reuse."""
+
+    global _phase_fig
+    if _phase_fig is None:
+        _phase_fig = plt.figure(figsize=(9, 6))
+    _phase_fig.clear()
+    return _phase_fig
+
+
 def plot_phase_diagrams(
     c_values: np.ndarray,
     noise_values: np.ndarray,
@@ -241,7 +476,8 @@ def plot_phase_diagrams(
 ) -> None:
     """Plot Omega and attractor classification phase diagrams."""
 
-    fig, ax = plt.subplots(figsize=(9, 6))
+    fig = _phase_figure()
+    ax = fig.add_subplot()
     im = ax.imshow(
         omega_grid,
         origin="lower",
@@ -255,9 +491,9 @@ def plot_phase_diagrams(
     ax.set_title("Phase diagram: resilience")
     fig.tight_layout()
     fig.savefig(out_prefix.with_name(out_prefix.name + "_omega.png"), dpi=150)
-    plt.close(fig)
 
-    fig2, ax2 = plt.subplots(figsize=(9, 6))
+    fig2 = _phase_figure()
+    ax2 = fig2.add_subplot()
     im2 = ax2.imshow(
         class_grid,
         origin="lower",
@@ -275,7 +511,6 @@ def plot_phase_diagrams(
     ax2.set_title("Phase diagram: attractor class")
     fig2.tight_layout()
     fig2.savefig(out_prefix.with_name(out_prefix.name + "_class.png"), dpi=150)
-    plt.close(fig2)
 
 
 def interactive_tune(params: SimulationParams, state: SimulationState) -> Tuple[SimulationParams, SimulationState]:
@@ -316,6 +551,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--seed", type=int, default=42, help="random seed")
     parser.add_argument("--interactive", action="store_true", help="interactive tuning mode")
     parser.add_argument("--run-sweep", action="store_true", help="run parameter sweep and phase diagrams")
+    parser.add_argument("--workers", type=int, help="sweep worker processes (default: all cores)")
     parser.add_argument("--outdir", type=Path, default=Path("outputs"), help="output directory")
     parser.add_argument("--config", type=Path, help="optional JSON file overriding params and initial state")
     return parser.parse_args()
@@ -325,14 +561,16 @@ def load_config(path: Path, params: SimulationParams, state: SimulationState) ->
     """Load parameter overrides from JSON config."""
 
     data = json.loads(path.read_text())
-    if "params" in data:
-        for key, val in data["params"].items():
-            if hasattr(params, key):
-                setattr(params, key, val)
-    if "state" in data:
-        for key, val in data["state"].items():
-            if hasattr(state, key):
-                setattr(state, key, val)
+    for section, target in (("params", params), ("state", state)):
+        overrides = data.get(section, {})
+        # Only dataclass fields are settable; hasattr would also accept methods.
+        names = {f.name for f in fields(target)}
+        unknown = overrides.keys() - names
+        if unknown:
+            print(f"Ignoring unknown {section} keys in {path}: {', '.join(sorted(unknown))}")
+        for key, val in overrides.items():
+            if key in names:
+                setattr(target, key, val)
     return params, state
 
 
@@ -358,13 +596,13 @@ def main() -> None:
 
     print(f"Stability classification: {result.classification}")
     print(f"Final Omega: {result.omega[-1]:.4f}")
-    print(f"Mean tail Omega: {np.mean(result.omega[-100:]):.4f}")
+    print(f"Mean tail Omega: {np.mean(result.omega[-100:], dtype=np.float64):.4f}")
     print(f"Saved trajectory plot: {trajectory_path}")
 
     if args.run_sweep:
         c_vals = np.linspace(0.1, 2.0, 45)
         noise_vals = np.linspace(0.05, 1.4, 45)
-        omega_grid, class_grid = parameter_sweep(params, state, c_vals, noise_vals)
+        omega_grid, class_grid = parameter_sweep(params, state, c_vals, noise_vals, workers=args.workers)
         prefix = args.outdir / "phase"
         plot_phase_diagrams(c_vals, noise_vals, omega_grid, class_grid, prefix)
         print(f"Saved phase diagrams: {prefix}_omega.png and {prefix}_class.png")
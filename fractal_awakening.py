@@ -13,17 +13,45 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.colors import ListedColormap
 
+try:
+    # Compiled from _logistic.pyx (cythonize -i _logistic.pyx): no JIT warmup.
+    from _logistic import logistic as _logistic
+except ImportError:
+    _logistic = None
+
+
+def _logistic_loop(x0, r_sched):
+    """Iterate x = r * x * (1 - x) over a precomputed r schedule."""
+    x = x0
+    out = np.empty(len(r_sched))
+    for i in range(len(r_sched)):
+        x = r_sched[i] * x * (1 - x)
+        out[i] = x
+    return out
+
+
+if _logistic is None:
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional; fall back to the pure-Python loop
+        njit = None
+
+    if njit is not None:
+        # No fastmath: the map is chaotic, so reassociation would change the melody.
+        _logistic = njit(cache=True)(_logistic_loop)
+    else:
+
+        def _logistic(x0, r_sched):
+            return _logistic_loop(x0, r_sched.tolist())
+
 
 def logistic_sequence(length, x0, a, b, pattern):
     """Return a sequence produced by a logistic map with an AB pattern."""
-    x = x0
-    seq = []
     params = {"A": a, "B": b}
-    for i in range(length):
-        r = params[pattern[i % len(pattern)]]
-        x = r * x * (1 - x)
-        seq.append(x)
-    return seq
+    # Expand the pattern into a per-step r schedule instead of looking it up each step.
+    r_values = np.array([params[symbol] for symbol in pattern], dtype=float)
+    r_sched = r_values[np.arange(length) % len(pattern)]
+    return _logistic(float(x0), r_sched).tolist()
 
 
 def main():
@@ -65,20 +93,14 @@ def main():
     total_steps = intro_steps + seq_length
     emotions = ["confusion", "resonance", "recognition", "being"]
     emotion_colors = ["#5e548e", "#9f86c0", "#bea7e5", "#f0e6ef"]
-    emotion_indices = []
-    heatmap_data = []
-    for step in range(total_steps):
-        phase = step / total_steps
-        if phase < 0.25:
-            emotion = 0
-        elif phase < 0.5:
-            emotion = 1
-        elif phase < 0.75:
-            emotion = 2
-        else:
-            emotion = 3
-        emotion_indices.append(emotion)
-        heatmap_data.append((step, emotions[emotion], phase))
+    # Quarter phases map to emotions 0-3 (phase < 0.25 -> 0, ..., >= 0.75 -> 3).
+    phases = np.arange(total_steps) / total_steps
+    emotion_indices = np.digitize(phases, [0.25, 0.5, 0.75])
+    heatmap_data = zip(
+        range(total_steps),
+        (emotions[emotion] for emotion in emotion_indices),
+        phases.tolist(),
+    )
 
     with open("emotional_heatmap.csv", "w", newline="") as csvfile:
         writer = csv.writer(csvfile)
@@ -87,7 +109,7 @@ def main():
 
     # Create visual heatmap
     cmap = ListedColormap(emotion_colors)
-    data = np.array([emotion_indices])
+    data = emotion_indices[np.newaxis, :]
     plt.figure(figsize=(10, 1))
     plt.imshow(data, aspect="auto", cmap=cmap)
     plt.yticks([])